@@ -1,81 +1,118 @@
 import sys
 import argparse
 import unittest
+import operator
+import re
+from array import array
+from functools import lru_cache
 
 
 
 NUM_REGS = 32             # Number of registers in the register file
 MEMORY_SIZE = 1024        # Number of words in data memory
-NOP = {'opcode': 'nop'}   # Representation of a no-operation
+OP_ADD, OP_SUB, OP_AND, OP_OR, OP_SLT, OP_ADDI, OP_SLTI, OP_LW, OP_SW, OP_NOP = range(10)   # Integer opcodes
+OPCODE_NAMES = ('add', 'sub', 'and', 'or', 'slt', 'addi', 'slti', 'lw', 'sw', 'nop')          # Opcode -> mnemonic, for logging
+OPCODES = {name: op for op, name in enumerate(OPCODE_NAMES)}                                  # Mnemonic -> opcode, for decoding
 LOG_FILE = "pipeline_log.txt"
+_TOKEN_RE = re.compile(r'[^,\s()]+')   # Operand tokens: anything between commas, whitespace and parentheses
+VERBOSE = True            # Write the per-cycle trace; --quiet turns it off and only the summary is logged
+
+class Instr: # A decoded instruction plus the result/addr/val that EX and MEM attach to it as it moves down the pipeline
+    __slots__ = ('op', 'rs', 'rt', 'rd', 'imm', 'src_mask', 'dst_mask', 'result', 'addr', 'val')
+
+    def __init__(self, op=OP_NOP, rs=0, rt=0, rd=None, imm=None):
+        self.op, self.rs, self.rt, self.rd, self.imm = op, rs, rt, rd, imm
+        # Register bitmasks for hazard/forwarding checks, fixed per instruction so they're computed once here
+        self.src_mask = ((1 << rs) | (1 << rt)) & ~1   # $0 never causes a hazard
+        self.dst_mask = 1 << rd if rd is not None else 0
+        self.result = self.addr = self.val = None
+
+    def copy(self): # Fresh pipeline copy of a decoded instruction, so stage writes never reach instruction_memory
+        dup = Instr.__new__(Instr)  # Skip __init__: the masks are copied, not re-derived
+        dup.op, dup.rs, dup.rt, dup.rd, dup.imm = self.op, self.rs, self.rt, self.rd, self.imm
+        dup.src_mask, dup.dst_mask = self.src_mask, self.dst_mask
+        dup.result = dup.addr = dup.val = None
+        return dup
+
+
+NOP = Instr()   # Representation of a no-operation
+
+# ALU dispatch table: opcode -> function of (rs value, rt value or immediate)
+EX_ALU = {
+    OP_ADD: operator.add,
+    OP_SUB: operator.sub,
+    OP_AND: operator.and_,
+    OP_OR: operator.or_,
+    OP_SLT: lambda a, b: int(a < b),
+    OP_ADDI: operator.add,
+    OP_SLTI: lambda a, b: int(a < b)
+}
+
+def wrap32(value): # Wrap a Python int to a signed 32-bit word, matching MIPS word width and the array('i') storage
+    return ((value + 0x80000000) & 0xFFFFFFFF) - 0x80000000
 
 
-registers = [0] * NUM_REGS      # General-purpose registers ($0–$31)
-data_memory = [0] * MEMORY_SIZE # Word-addressable data memory
-instruction_memory = []         # List of instruction strings
+registers = array('i', [0] * NUM_REGS)      # General-purpose registers ($0–$31), 32-bit signed words
+data_memory = array('i', [0] * MEMORY_SIZE) # Word-addressable data memory, 32-bit signed words
+instruction_memory = []         # List of decoded Instr objects
 pc = 0                           # Program counter (index into instruction_memory)
 cycle = 0                        # Current cycle count
 instr_executed = 0               # Count of instructions that have reached WB
-log_lines = []                   # Accumulates log output per cycle
-
-# Pipeline registers between stages
-pipeline = {
-    'IF_ID': None,   # Between Fetch and Decode
-    'ID_EX': None,   # Between Decode and Execute
-    'EX_MEM': None,  # Between Execute and Memory
-    'MEM_WB': None   # Between Memory and Write-Back
-}
+_log_fh = None                   # Open log file that each cycle streams into (set by run())
+
+# Pipeline registers between stages, held in fixed list slots
+IF_ID, ID_EX, EX_MEM, MEM_WB = range(4)   # Between Fetch/Decode, Decode/Execute, Execute/Memory, Memory/Write-Back
+STAGE_NAMES = ('IF_ID', 'ID_EX', 'EX_MEM', 'MEM_WB')
+pipeline = [None] * len(STAGE_NAMES)
 
 
 def reset(): # Restore all state to its initial, empty condition. Called before each new simulation/test
     global registers, data_memory, instruction_memory
-    global pc, cycle, instr_executed, log_lines, pipeline
+    global pc, cycle, instr_executed
 
-    registers = [0] * NUM_REGS
-    data_memory = [0] * MEMORY_SIZE
+    registers = array('i', [0] * NUM_REGS)
+    data_memory = array('i', [0] * MEMORY_SIZE)
     instruction_memory = []
     pc = 0
     cycle = 0
     instr_executed = 0
-    log_lines = []
-    pipeline = {stage: None for stage in pipeline}
+    pipeline[:] = [None] * len(STAGE_NAMES)
 
 
-def parse_instruction(line): # Turns text lines into a dictionary where opcodes, rd, rs, rt and imm if required is sought out.
-    tokens = line.replace(",", "").split()
+def parse_instruction(line): # Turns a text line into an Instr; each call gets its own copy, so callers may write result/addr/val freely
+    return _decode_line(line).copy()
+
+@lru_cache(maxsize=4096)
+def _decode_line(line): # Cached decoder: repeated source lines are tokenized once; the shared Instr it returns is never handed out directly
+    tokens = _TOKEN_RE.findall(line)
     if not tokens:
         return NOP
 
-    opcode = tokens[0].lower()
-    instr = {'opcode': opcode}
+    opcode = OPCODES.get(tokens[0].lower())
 
-    if opcode in ('add', 'sub', 'and', 'or', 'slt'):
+    if opcode in (OP_ADD, OP_SUB, OP_AND, OP_OR, OP_SLT):
         # R-type format: opcode rd, rs, rt
-        instr.update({
-            'rd': int(tokens[1][1:]),
-            'rs': int(tokens[2][1:]),
-            'rt': int(tokens[3][1:])
-        })
-    elif opcode in ('addi', 'slti'):
-        # I-type arithmetic: opcode rt, rs, imm
-        instr.update({
-            'rt': int(tokens[1][1:]),
-            'rs': int(tokens[2][1:]),
-            'imm': int(tokens[3])
-        })
-    elif opcode in ('lw', 'sw'):
-        # Load/store: opcode rt, offset(rs)
+        rd = int(tokens[1][1:])
+        rs = int(tokens[2][1:])
+        rt = int(tokens[3][1:])
+        imm = None
+    elif opcode in (OP_ADDI, OP_SLTI):
+        # I-type arithmetic: opcode rt, rs, imm (rt is also the destination)
+        rt = rd = int(tokens[1][1:])
+        rs = int(tokens[2][1:])
+        imm = wrap32(int(tokens[3]))
+    elif opcode in (OP_LW, OP_SW):
+        # Load/store: opcode rt, offset(rs) (lw writes rt, sw writes nothing)
         rt = int(tokens[1][1:])
-        offset, rs = tokens[2].replace(')', '').split('(')
-        instr.update({
-            'rt': rt,
-            'rs': int(rs[1:]),
-            'imm': int(offset)
-        })
+        imm = wrap32(int(tokens[2]))
+        rs = int(tokens[3][1:])
+        rd = rt if opcode == OP_LW else None
     else:
         return NOP
 
-    return instr
+    if rd == 0:  # $0 is hard-wired: drop the write here so WB and forwarding never see it
+        rd = None
+    return Instr(opcode, rs, rt, rd, imm)
 
 def resolve_labels(program):  # Remove label from a list of lines and return list of pure instructions
     label_map = {}
@@ -92,158 +129,148 @@ def resolve_labels(program):  # Remove label from a list of lines and return lis
 
 
 def detect_load_use_hazard(ID_instr, EX_instr): # Look for a load-use hazard: if the EX stage is loading into rt, and the ID stage needs that same register (rs or rt), return True.
-    if EX_instr and EX_instr['opcode'] == 'lw':
-        rt = EX_instr.get('rt')
-        return rt is not None and (ID_instr.get('rs') == rt or ID_instr.get('rt') == rt)
-    return False
+    return EX_instr is not None and EX_instr.op == OP_LW and bool(EX_instr.dst_mask & ID_instr.src_mask)
 
 def detect_forwarding_sources(ID_instr):  # Determine for each source of operand whihc register to use
-    forwardA, forwardB = 'REG', 'REG'
-    src1, src2 = ID_instr.get('rs'), ID_instr.get('rt')
-
-    ex_mem = pipeline['EX_MEM']
-    if ex_mem and ex_mem.get('rd') not in (None, 0):
-        if ex_mem['rd'] == src1:
-            forwardA = 'EX'
-        if ex_mem['rd'] == src2:
-            forwardB = 'EX'
-
-    mem_wb = pipeline['MEM_WB']
-    if mem_wb and mem_wb.get('rd') not in (None, 0):
-        if forwardA == 'REG' and mem_wb['rd'] == src1:
-            forwardA = 'MEM'
-        if forwardB == 'REG' and mem_wb['rd'] == src2:
-            forwardB = 'MEM'
+    src1, src2 = ID_instr.rs, ID_instr.rt
+    ex_mem, mem_wb = pipeline[EX_MEM], pipeline[MEM_WB]
+    ex_mask = ex_mem.dst_mask if ex_mem else 0
+    mem_mask = mem_wb.dst_mask if mem_wb else 0
 
+    forwardA = 'EX' if (ex_mask >> src1) & 1 else ('MEM' if (mem_mask >> src1) & 1 else 'REG')
+    forwardB = 'EX' if (ex_mask >> src2) & 1 else ('MEM' if (mem_mask >> src2) & 1 else 'REG')
     return forwardA, forwardB
 
 def apply_forwarding(instr, forwardA, forwardB):   # Fetching operands if required in the fowarding stage
-   
-    rs_val = registers[instr['rs']] if instr.get('rs') is not None else 0
-    rt_val = registers[instr['rt']] if instr.get('rt') is not None else 0
+    regs, pipe = registers, pipeline  # Local aliases: LOAD_FAST instead of LOAD_GLOBAL
+
+    rs_val = regs[instr.rs]
+    rt_val = regs[instr.rt]
 
     if forwardA == 'EX':
-        rs_val = pipeline['EX_MEM']['result']
+        rs_val = pipe[EX_MEM].result
     elif forwardA == 'MEM':
-        rs_val = pipeline['MEM_WB']['result']
+        rs_val = pipe[MEM_WB].result
 
     if forwardB == 'EX':
-        rt_val = pipeline['EX_MEM']['result']
+        rt_val = pipe[EX_MEM].result
     elif forwardB == 'MEM':
-        rt_val = pipeline['MEM_WB']['result']
+        rt_val = pipe[MEM_WB].result
 
     return rs_val, rt_val
 
 
-def pipeline_step(): # The infamous 5-step cycle
+def pipeline_step(): # The infamous 5-step cycle; returns True once the program has fully drained from the pipeline
   
-    global pc, cycle, instr_executed, pipeline
+    global pc, cycle, instr_executed
     cycle += 1
-    log = [f"\nCycle {cycle}"]
+    log = [f"\nCycle {cycle}"] if VERBOSE else None
+    regs, dmem, pipe = registers, data_memory, pipeline  # Bind globals to locals once; each later use is a fast local load
 
     
-    wb = pipeline['MEM_WB'] # Write Back
-    if wb and wb.get('opcode') != 'nop':
-        rd = wb.get('rd')
+    wb = pipe[MEM_WB] # Write Back
+    if wb and wb.op != OP_NOP:
+        rd = wb.rd
         if rd is not None:
-            registers[rd] = wb['result']
+            regs[rd] = wb.result
         instr_executed += 1
 
    
-    mem = pipeline['EX_MEM']  # Memory Access 
+    mem = pipe[EX_MEM]  # Memory Access 
     if mem:
-        if mem['opcode'] == 'lw':
-            addr = mem['addr'] // 4
-            mem['result'] = data_memory[addr]
-        elif mem['opcode'] == 'sw':
-            data_memory[mem['addr'] // 4] = mem['val']
-        pipeline['MEM_WB'] = mem
+        if mem.op == OP_LW:
+            assert mem.addr >= 0, "negative memory address"
+            mem.result = dmem[mem.addr >> 2]  # Byte address -> word index
+        elif mem.op == OP_SW:
+            assert mem.addr >= 0, "negative memory address"
+            dmem[mem.addr >> 2] = mem.val
+        pipe[MEM_WB] = mem
     else:
-        pipeline['MEM_WB'] = None
+        pipe[MEM_WB] = None
 
 
-    ex = pipeline['ID_EX']     # Execute 
+    ex = pipe[ID_EX]     # Execute 
     if ex:
         fA, fB = detect_forwarding_sources(ex)
         rs_val, rt_val = apply_forwarding(ex, fA, fB)
 
-        op = ex['opcode']
-        if op == 'add':
-            ex['result'] = rs_val + rt_val
-        elif op == 'sub':
-            ex['result'] = rs_val - rt_val
-        elif op == 'and':
-            ex['result'] = rs_val & rt_val
-        elif op == 'or':
-            ex['result'] = rs_val | rt_val
-        elif op == 'slt':
-            ex['result'] = 1 if rs_val < rt_val else 0
-        elif op == 'addi':
-            ex['result'] = rs_val + ex['imm']
-        elif op == 'slti':
-            ex['result'] = 1 if rs_val < ex['imm'] else 0
-        elif op == 'lw':
-            ex['addr'] = rs_val + ex['imm']
-        elif op == 'sw':
-            ex['addr'] = rs_val + ex['imm']
-            ex['val'] = rt_val
-
-        
-        if op in ('addi', 'slti', 'lw'): # For I-types and loads, rd field comes from rt
-            ex['rd'] = ex.get('rt')
-        pipeline['EX_MEM'] = ex
+        op, imm = ex.op, ex.imm
+        if op in EX_ALU:
+            ex.result = wrap32(EX_ALU[op](rs_val, rt_val if imm is None else imm))  # I-types use imm, R-types use rt
+        elif op == OP_LW:
+            ex.addr = rs_val + imm
+        elif op == OP_SW:
+            ex.addr = rs_val + imm
+            ex.val = rt_val
+        pipe[EX_MEM] = ex
     else:
-        pipeline['EX_MEM'] = None
+        pipe[EX_MEM] = None
 
   
-    if pipeline['IF_ID']:   # Decode
-        instr = parse_instruction(pipeline['IF_ID'])
-        if detect_load_use_hazard(instr, pipeline['ID_EX']):
-            log.append("Data hazard detected — Stalling")   # Bubble insertion to stall
-            pipeline['ID_EX'] = pipeline['EX_MEM'] = pipeline['MEM_WB'] = None
+    if pipe[IF_ID]:   # Decode
+        instr = pipe[IF_ID]
+        if detect_load_use_hazard(instr, pipe[ID_EX]):
+            if VERBOSE:
+                log.append("Data hazard detected — Stalling")   # Bubble insertion to stall
+            pipe[ID_EX] = pipe[EX_MEM] = pipe[MEM_WB] = None
             log_pipeline_state(log)
             return
-        pipeline['ID_EX'] = instr
+        pipe[ID_EX] = instr
     else:
-        pipeline['ID_EX'] = None
+        pipe[ID_EX] = None
 
     
     if pc < len(instruction_memory): # Instruction Fetch
-        fetched = instruction_memory[pc]
-        pipeline['IF_ID'] = fetched
-        log.append(f"Fetched instruction: {fetched}")
+        fetched = instruction_memory[pc].copy()
+        pipe[IF_ID] = fetched
+        if VERBOSE:
+            log.append(f"Fetched instruction: {format_instr(fetched)}")
         pc += 1
     else:
-        pipeline['IF_ID'] = None
+        pipe[IF_ID] = None
 
     log_pipeline_state(log)
+    return pc >= len(instruction_memory) and not any(pipe)
+
+def format_instr(instr, with_results=False): # Render an instruction as a tuple with its mnemonic; latches past EX also show result/addr/val
+    fields = (OPCODE_NAMES[instr.op], instr.rs, instr.rt, instr.rd, instr.imm)
+    if with_results:
+        fields += (instr.result, instr.addr, instr.val)
+    return repr(fields)
 
 def log_pipeline_state(log): # Add contents of registers to cycle log
+    if not VERBOSE:
+        return
 
     log.append("Pipeline State:")
-    for stage in ('IF_ID', 'ID_EX', 'EX_MEM', 'MEM_WB'):
-        content = pipeline[stage] if pipeline[stage] else 'NOP'
-        log.append(f"  {stage}: {content}")
-    log.append(f"  Registers [0–7]: {registers[:8]}")
+    for stage, latch in enumerate(pipeline):
+        content = format_instr(latch, stage >= EX_MEM) if latch else 'NOP'
+        log.append(f"  {STAGE_NAMES[stage]}: {content}")
+    log.append(f"  Registers [0–7]: {registers[:8].tolist()}")
     log.append(f"  Instructions executed so far: {instr_executed}")
-    log_lines.append("\n".join(log))
+    if _log_fh:
+        _log_fh.write("\n".join(log))
+        _log_fh.write("\n")
 
-def load_program(filename):
+def load_program(filename): # Read, strip labels and decode every line once up front
     with open(filename) as f:
         lines = [l.strip() for l in f if l.strip()]
     code, _ = resolve_labels(lines)
-    return code
+    return [parse_instruction(l) for l in code]
 
-def run(filename, cycles=30): # Load the program, run for the given number of cycles, then write out the log and summary
+def run(filename, cycles=30): # Load the program, run for the given number of cycles, streaming the log and summary to LOG_FILE
  
-    global instruction_memory
+    global instruction_memory, _log_fh
     instruction_memory = load_program(filename)
-    for _ in range(cycles):
-        pipeline_step()
-
-    log_lines.append(f"\nTotal instructions executed: {instr_executed}")
     with open(LOG_FILE, "w") as f:
-        f.write("\n".join(log_lines))
+        _log_fh = f
+        try:
+            for _ in range(cycles):
+                if pipeline_step():  # Nothing left to fetch or retire, stop early
+                    break
+            f.write(f"\nTotal instructions executed: {instr_executed}")
+        finally:
+            _log_fh = None
 
     print(f"Simulation complete. Log written to '{LOG_FILE}'.")
     print(f"Total instructions executed: {instr_executed}")
@@ -272,38 +299,87 @@ class TestSimulator(unittest.TestCase): # Testing
         self.assertEqual(registers[4], 15)
         self.assertEqual(data_memory[0], 15)
 
+    def test_stops_when_drained(self):
+        reset()
+        run(self.program_file, cycles=1000)
+        self.assertEqual(instr_executed, 5)
+        self.assertLess(cycle, 20)
+
 class TestUnitFunctions(unittest.TestCase):
+    @staticmethod
+    def _fields(instr):
+        return (instr.op, instr.rs, instr.rt, instr.rd, instr.imm, instr.src_mask, instr.dst_mask)
+
+    @staticmethod
+    def _latch(line, result): # Decoded instruction as it sits in EX_MEM/MEM_WB after computing result
+        instr = parse_instruction(line).copy()
+        instr.result = result
+        return instr
+
     def test_parse_instruction_basic(self):
-        self.assertEqual(parse_instruction("and $5, $6, $7"),
-                         {'opcode':'and','rd':5,'rs':6,'rt':7})
-        self.assertEqual(parse_instruction("addi $2, $3, -1"),
-                         {'opcode':'addi','rt':2,'rs':3,'imm':-1})
-        self.assertEqual(parse_instruction(""), NOP)
+        self.assertEqual(self._fields(parse_instruction("and $5, $6, $7")), (OP_AND, 6, 7, 5, None, 0b11000000, 0b100000))
+        self.assertEqual(self._fields(parse_instruction("addi $2, $3, -1")), (OP_ADDI, 3, 2, 2, -1, 0b1100, 0b100))
+        self.assertEqual(self._fields(parse_instruction("sw $4, 8($5)")), (OP_SW, 5, 4, None, 8, 0b110000, 0))
+        self.assertIsNone(parse_instruction("add $0, $1, $2").rd)
+        self.assertEqual(self._fields(parse_instruction("")), self._fields(NOP))
+        self.assertEqual(self._fields(parse_instruction("lw $4,-8($29)")), self._fields(parse_instruction("lw   $4, -8( $29 )")))
+        self.assertEqual(format_instr(parse_instruction("lw $4, 0($0)")), "('lw', 0, 4, 4, 0)")
 
     def test_detect_load_use_hazard(self):
-        lw_instr = {'opcode':'lw','rt':2,'rs':0,'imm':0}
-        id_instr = {'opcode':'add','rs':2,'rt':3}
+        lw_instr = parse_instruction("lw $2, 0($0)")
+        id_instr = parse_instruction("add $1, $2, $3")
         self.assertTrue(detect_load_use_hazard(id_instr, lw_instr))
-        self.assertFalse(detect_load_use_hazard({'opcode':'add','rs':4,'rt':5}, lw_instr))
+        self.assertFalse(detect_load_use_hazard(parse_instruction("add $1, $4, $5"), lw_instr))
+        self.assertFalse(detect_load_use_hazard(id_instr, None))
+
+    def test_register_masks(self):
+        add = parse_instruction("add $3, $1, $2")
+        self.assertEqual((add.src_mask, add.dst_mask), (0b110, 0b1000))
+        self.assertEqual(parse_instruction("sw $2, 0($1)").dst_mask, 0)
+        self.assertEqual(parse_instruction("addi $0, $0, 1").dst_mask, 0)
+        self.assertEqual((NOP.src_mask, NOP.dst_mask), (0, 0))
+
+    def test_parse_returns_private_copy(self):
+        first = parse_instruction("add $3, $1, $2")
+        first.result = 42
+        second = parse_instruction("add $3, $1, $2")
+        self.assertIsNot(first, second)
+        self.assertIsNone(second.result)
+        self.assertEqual(self._fields(first.copy()), self._fields(second))
+
+    def test_fetch_copies_instruction(self):
+        reset()
+        instruction_memory.append(parse_instruction("addi $1, $0, 3"))
+        for _ in range(3):
+            pipeline_step()
+        self.assertEqual(pipeline[EX_MEM].result, 3)
+        self.assertIsNone(instruction_memory[0].result)
 
     def test_detect_forwarding_sources(self):
         reset()
-        pipeline['EX_MEM'] = {'opcode':'add','rd':2,'result':99}
-        pipeline['MEM_WB'] = {'opcode':'nop'}
-        fA, fB = detect_forwarding_sources({'rs':2,'rt':3})
+        pipeline[EX_MEM] = self._latch("add $2, $0, $0", 99)
+        pipeline[MEM_WB] = NOP
+        fA, fB = detect_forwarding_sources(parse_instruction("add $4, $2, $3"))
         self.assertEqual((fA,fB), ('EX','REG'))
-        pipeline['EX_MEM'] = None
-        pipeline['MEM_WB'] = {'opcode':'add','rd':3,'result':55}
-        fA, fB = detect_forwarding_sources({'rs':1,'rt':3})
+        pipeline[EX_MEM] = None
+        pipeline[MEM_WB] = self._latch("add $3, $0, $0", 55)
+        fA, fB = detect_forwarding_sources(parse_instruction("add $4, $1, $3"))
         self.assertEqual((fA,fB), ('REG','MEM'))
 
     def test_apply_forwarding(self):
         reset()
         registers[1], registers[2] = 10, 20
-        pipeline['EX_MEM'] = {'opcode':'add','rd':1,'result':100}
-        pipeline['MEM_WB'] = {'opcode':'add','rd':2,'result':200}
-        self.assertEqual(apply_forwarding({'rs':1,'rt':2}, 'EX','EX'), (100,100))
-        self.assertEqual(apply_forwarding({'rs':1,'rt':2}, 'REG','MEM'), (10,200))
+        pipeline[EX_MEM] = self._latch("add $1, $0, $0", 100)
+        pipeline[MEM_WB] = self._latch("add $2, $0, $0", 200)
+        instr = parse_instruction("add $3, $1, $2")
+        self.assertEqual(apply_forwarding(instr, 'EX','EX'), (100,100))
+        self.assertEqual(apply_forwarding(instr, 'REG','MEM'), (10,200))
+
+    def test_ex_alu(self):
+        self.assertEqual(EX_ALU[OP_SUB](7, 10), -3)
+        self.assertEqual(EX_ALU[OP_AND](6, 3), 2)
+        self.assertEqual(EX_ALU[OP_SLT](-1, 0), 1)
+        self.assertEqual(EX_ALU[OP_SLTI](4, 4), 0)
 
     def _run_and_read_log(self, prog, cycles=20):
         reset()
@@ -318,15 +394,39 @@ class TestUnitFunctions(unittest.TestCase):
         log = self._run_and_read_log(["addi $1,$0,1"])
         self.assertIn("Total instructions executed", log)
 
+    def test_32bit_wraparound(self):
+        self.assertEqual(wrap32(2**31), -2**31)
+        self.assertEqual(wrap32(-2**31 - 1), 2**31 - 1)
+        self._run_and_read_log(["addi $1, $0, 3000000000",
+                                "addi $2, $0, 2147483647",
+                                "addi $2, $2, 1",
+                                "sub  $3, $2, $1"])
+        self.assertEqual(registers[1], 3000000000 - 2**32)
+        self.assertEqual(registers[2], -2**31)
+        self.assertEqual(registers[3], wrap32(-2**31 - (3000000000 - 2**32)))
+
+    def test_quiet_log(self):
+        global VERBOSE
+        VERBOSE = False
+        try:
+            log = self._run_and_read_log(["addi $1, $0, 1"])
+        finally:
+            VERBOSE = True
+        self.assertNotIn("Cycle", log)
+        self.assertIn("Total instructions executed: 1", log)
+        self.assertEqual(registers[1], 1)
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("program", nargs="?", help="Text file of instructions")
     parser.add_argument("--test", action="store_true", help="Run unit tests")
+    parser.add_argument("--quiet", action="store_true", help="Skip the per-cycle trace, log only the summary")
     args = parser.parse_args()
 
     if args.test:
-        unittest.main(argv=[sys.argv[0]])
+        unittest.main(argv=[sys.argv[0]])  # Tests always run with the trace on; --quiet only affects simulation runs
     elif args.program:
+        VERBOSE = not args.quiet
         run(args.program)
     else:
-        print("Usage: python simulator.py <program.txt> [--test]")
+        print("Usage: python simulator.py <program.txt> [--quiet] | --test")